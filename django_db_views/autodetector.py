@@ -1,7 +1,8 @@
-from typing import Type
+import functools
+import sys
+from typing import Iterable, Type
 
 import django
-import six
 import sqlparse
 from django.apps import apps
 from django.conf import settings
@@ -31,6 +32,47 @@ from django_db_views.migration_functions import (
 )
 
 
+# Ordered probes: DBMaterializedView is itself a DBView, so it must win.
+_MIGRATION_CLASSES = {
+    DBMaterializedView: (
+        ForwardMaterializedViewMigration,
+        BackwardMaterializedViewMigration,
+        DropMaterializedView,
+    ),
+    DBView: (ForwardViewMigration, BackwardViewMigration, DropView),
+}
+
+
+@functools.cache
+def _resolve_migration_classes(model) -> tuple:
+    # Cached per model class, so the issubclass MRO walk happens once.
+    for base_class, migration_classes in _MIGRATION_CLASSES.items():
+        if issubclass(model, base_class):
+            return migration_classes
+    raise NotImplementedError
+
+
+@functools.cache
+def _default_view_engine() -> str:
+    # Resolved lazily so importing this module does not require configured
+    # settings; cached to skip the lazy-settings machinery on every lookup.
+    return settings.DATABASES["default"]["ENGINE"]
+
+
+@functools.lru_cache(maxsize=1024)
+def _sql_normalize(s: str) -> str:
+    # Cached on the raw string: the same previous view definition shows up in
+    # many migration graph nodes, so it should be parsed by sqlparse only once.
+    return sqlparse.format(
+        s,
+        compact=True,
+        keyword_case="upper",
+        identifier_case="lower",
+        reindent=True,
+        strip_comments=True,
+    ).strip()
+
+
 class ViewMigrationAutoDetector(MigrationAutodetector):
     """
     We have overwritten only the `_detect_changes` function.
@@ -40,6 +82,12 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
     It's detecting only view model changes and comment changes.
     """
 
+    # Lazy view-state caches; class-level defaults keep the
+    # get_previous/current_view_models_state methods safe to call on a
+    # freshly constructed detector, outside a _detect_changes run.
+    _previous_view_states = None
+    _current_view_states = None
+
     def _detect_changes(self, convert_apps=None, graph=None) -> dict:
         # <START copy paste from MigrationAutodetector, depends on django version>
         if django.VERSION >= (4,):
@@ -92,6 +140,9 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
         self.altered_indexes = {}
         self.altered_constraints = {}
         self.renamed_fields = {}
+        # Reset the lazy view-state caches for this run.
+        self._previous_view_states = None
+        self._current_view_states = None
 
         # Prepare some old/new state and model lists, separating
         # proxy models and ignoring unmigrated apps.
@@ -134,22 +185,40 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
         self.kept_proxy_keys = self.old_proxy_keys & self.new_proxy_keys
         self.kept_unmanaged_keys = self.old_unmanaged_keys & self.new_unmanaged_keys
         self.through_users = {}
+        # Per-model field maps let generate_altered_fields intersect many
+        # small frozensets instead of one big set of 3-tuples.  The flat
+        # old/new_field_keys sets are still built below because the base
+        # class (create_renamed_fields and friends) works on them.
+        self.old_field_map = {
+            (app_label, model_name): frozenset(
+                self.from_state.models[
+                    app_label,
+                    self.renamed_models.get((app_label, model_name), model_name),
+                ].fields
+            )
+            for app_label, model_name in self.kept_unmanaged_keys
+        }
+        self.new_field_map = {
+            (app_label, model_name): frozenset(
+                self.to_state.models[app_label, model_name].fields
+            )
+            for app_label, model_name in self.kept_unmanaged_keys
+        }
         self.old_field_keys = {
             (app_label, model_name, field_name)
-            for app_label, model_name in self.kept_unmanaged_keys
-            for field_name in self.from_state.models[
-                app_label, self.renamed_models.get((app_label, model_name), model_name),
-            ].fields
+            for (app_label, model_name), field_names in self.old_field_map.items()
+            for field_name in field_names
         }
         self.new_field_keys = {
             (app_label, model_name, field_name)
-            for app_label, model_name in self.kept_unmanaged_keys
-            for field_name in self.to_state.models[app_label, model_name].fields
+            for (app_label, model_name), field_names in self.new_field_map.items()
+            for field_name in field_names
         }
 
     def delete_old_views(self):
+        registered_tables = frozenset(DBViewsRegistry)
         for (app_label, table_name), model_state in self.get_previous_view_models_state().items():
-            if model_state.table_name not in DBViewsRegistry:
+            if model_state.table_name not in registered_tables:
                 self.add_operation(
                     app_label,
                     ViewDropRunPython(
@@ -166,52 +235,62 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
                 )
 
     def get_previous_view_models_state(self) -> dict:
-        view_models = {}
-        for (app_label, table_name), model_state in self.from_state.models.items():
-            if isinstance(model_state, DBViewModelState):
-                key = (app_label, table_name)
-                view_models[key] = model_state
-        return view_models
+        # The from_state scan is O(total_models); do it at most once per run.
+        if self._previous_view_states is None:
+            self._previous_view_states = {
+                (app_label, table_name): model_state
+                for (app_label, table_name), model_state
+                in self.from_state.models.items()
+                if isinstance(model_state, DBViewModelState)
+            }
+        return self._previous_view_states
 
     def get_current_view_models_state(self) -> dict:
-        view_models = {}
-        for (app_label, table_name), model_state in self.to_state.models.items():
-            if isinstance(model_state, DBViewModelState):
-                key = (app_label, table_name)
-                view_models[key] = model_state
-        return view_models
+        if self._current_view_states is None:
+            self._current_view_states = {
+                (app_label, table_name): model_state
+                for (app_label, table_name), model_state
+                in self.to_state.models.items()
+                if isinstance(model_state, DBViewModelState)
+            }
+        return self._current_view_states
 
     @staticmethod
     def get_current_view_models():
+        # DBViewsRegistry is already keyed by db_table, so iterating the
+        # registered view models directly is O(#views) instead of scanning
+        # every model in every app. Registrations whose model is no longer
+        # installed in the app registry (the registry is never cleaned up,
+        # only apps.all_models is) are skipped.
         view_models = {}
-        for app_label, models in apps.all_models.items():
-            for model_name, model_class in models.items():
-                if model_class._meta.db_table in DBViewsRegistry:
-                    key = (app_label, model_name)
-                    view_models[key] = model_class
+        for model_class in DBViewsRegistry.values():
+            app_label = model_class._meta.app_label
+            model_name = model_class._meta.model_name
+            if apps.all_models.get(app_label, {}).get(model_name) is model_class:
+                view_models[(app_label, model_name)] = model_class
         return view_models
 
     @staticmethod
     def is_same_views(current: str, new: str) -> bool:
-        def sql_normalize(s: str) -> str:
-            return sqlparse.format(
-                s,
-                compact=True,
-                keyword_case="upper",
-                identifier_case="lower",
-                reindent=True,
-                strip_comments=True,
-            ).strip()
-
-        return sql_normalize(current) == sql_normalize(new)
+        # Unchanged view definitions are byte-identical between runs, so a
+        # plain string compare answers the common case without sqlparse.
+        if current.strip() == new.strip():
+            return True
+        return _sql_normalize(current) == _sql_normalize(new)
 
     def generate_views_operations(self, graph: MigrationGraph) -> None:
         view_models = self.get_current_view_models()
+        view_operation_index, parents_in_app = self._build_view_operation_index(graph)
         for (app_label, model_name), view_model in view_models.items():
             new_view_definition = self.get_view_definition_from_model(view_model)
             for engine, latest_view_definition in new_view_definition.items():
                 current_view_definition = self.get_previous_view_definition_state(
-                    graph, app_label, view_model._meta.db_table, engine
+                    graph,
+                    app_label,
+                    view_model._meta.db_table,
+                    engine,
+                    view_operation_index,
+                    parents_in_app,
                 )
                 if not self.is_same_views(
                     current_view_definition, latest_view_definition
@@ -220,9 +299,12 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
                     model_state = self.to_state.models[app_label, model_name]
                     dependencies = []
                     for base in model_state.bases:
-                        if isinstance(base, six.string_types) and "." in base:
-                            base_app_label, base_name = base.split(".", 1)
-                            dependencies.append((base_app_label, base_name, None, True))
+                        if isinstance(base, str):
+                            base_app_label, _, base_name = base.partition(".")
+                            if base_name:
+                                dependencies.append(
+                                    (base_app_label, base_name, None, True)
+                                )
                     self.add_operation(
                         app_label,
                         ViewRunPython(
@@ -243,29 +325,14 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
 
     @staticmethod
     def get_forward_migration_class(model) -> Type[ForwardViewMigrationBase]:
-        if issubclass(model, DBMaterializedView):
-            return ForwardMaterializedViewMigration
-        if issubclass(model, DBView):
-            return ForwardViewMigration
-        else:
-            raise NotImplementedError
+        return _resolve_migration_classes(model)[0]
 
     @staticmethod
     def get_backward_migration_class(model) -> Type[BackwardViewMigrationBase]:
-        if issubclass(model, DBMaterializedView):
-            return BackwardMaterializedViewMigration
-        if issubclass(model, DBView):
-            return BackwardViewMigration
-        else:
-            raise NotImplementedError
+        return _resolve_migration_classes(model)[1]
 
     def get_drop_migration_class(self, model) -> Type[DropViewMigration]:
-        if issubclass(model, DBMaterializedView):
-            return DropMaterializedView
-        elif issubclass(model, DBView):
-            return DropView
-        else:
-            raise NotImplementedError
+        return _resolve_migration_classes(model)[2]
 
     @classmethod
     def get_view_definition_from_model(cls, view_model: DBView) -> dict:
@@ -277,81 +344,87 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
 
         if isinstance(raw_view_definition, dict):
             for engine, definition in raw_view_definition.items():
-                view_definitions[engine] = cls.get_cleaned_view_definition_value(
-                    definition
-                )
+                view_definitions[
+                    sys.intern(engine)
+                ] = cls.get_cleaned_view_definition_value(definition)
         else:
-            engine = settings.DATABASES["default"]["ENGINE"]
+            engine = _default_view_engine()
             view_definitions[engine] = cls.get_cleaned_view_definition_value(
                 raw_view_definition
             )
         return view_definitions
 
+    def _build_view_operation_index(self, graph: MigrationGraph) -> tuple[dict, dict]:
+        """
+        Index every ViewRunPython operation in the graph in a single pass,
+        so that get_previous_view_definition_state does not have to rescan
+        migration operations once per (view, engine) pair.
+
+        Returns a pair of dicts:
+            (app_label, table_name, engine) -> {node_key: view_definition}
+            node_key -> list of same-app parent node keys (for the backward walk)
+        """
+        view_operation_index = {}
+        parents_in_app = {}
+        for node_key, migration in graph.nodes.items():
+            app_label = node_key[0]
+            for operation in migration.operations:
+                if isinstance(operation, SeparateDatabaseAndState):
+                    view_operations = [
+                        op
+                        for op in operation.database_operations
+                        if isinstance(op, ViewRunPython)
+                    ]
+                    if not view_operations:
+                        continue
+                    assert (
+                        len(view_operations) <= 1
+                    ), ("SeparateDatabaseAndState can't contain more than one "
+                        "ViewRunPython operation")
+                    operation = view_operations[0]
+                elif not isinstance(operation, ViewRunPython):
+                    continue
+                (
+                    table_name,
+                    view_engine,
+                ) = self._get_view_identifiers_from_operation(operation)
+                # Store the extracted definition, not the operation, so the
+                # backward walk needs no attribute chasing at all.
+                view_operation_index.setdefault(
+                    (app_label, table_name, view_engine), {}
+                )[node_key] = operation.code.view_definition.strip()
+        for node_key, node in graph.node_map.items():
+            parents_in_app[node_key] = [
+                parent for parent in node.parents if parent[0] == node_key[0]
+            ]
+        return view_operation_index, parents_in_app
+
     def get_previous_view_definition_state(
         self, graph: MigrationGraph, app_label: str, for_table_name: str, engine: str,
+        view_operation_index: dict, parents_in_app: dict,
     ) -> str:
         nodes = graph.leaf_nodes(app_label)
         last_node = nodes[0] if nodes else None
-
+        definitions_by_node = view_operation_index.get(
+            (app_label, for_table_name, engine), {}
+        )
         while last_node:
-            migration = graph.nodes[last_node]
-            if migration.operations:
-                for operation in migration.operations:
-                    if isinstance(operation, ViewRunPython):
-                        (
-                            table_name,
-                            previous_view_engine,
-                        ) = self._get_view_identifiers_from_operation(operation)
-                        if (
-                            table_name == for_table_name
-                            and previous_view_engine == engine
-                        ):
-                            return operation.code.view_definition.strip()
-                    elif isinstance(operation, SeparateDatabaseAndState):
-                        view_operations = list(
-                            filter(
-                                lambda op: isinstance(op, ViewRunPython),
-                                operation.database_operations,
-                            )
-                        )
-                        if view_operations:
-                            assert (
-                                len(view_operations) <= 1
-                            ), ("SeparateDatabaseAndState can't contain more than one "
-                                "ViewRunPython operation")
-                            view_operation = view_operations[0]
-                            (
-                                table_name,
-                                previous_view_engine,
-                            ) = self._get_view_identifiers_from_operation(
-                                view_operation
-                            )
-                            if (
-                                table_name == for_table_name
-                                and previous_view_engine == engine
-                            ):
-                                return view_operation.code.view_definition.strip()
+            view_definition = definitions_by_node.get(last_node)
+            if view_definition is not None:
+                return view_definition
             # right now i get only migrations from the same app.
-            app_parents = list(
-                sorted(
-                    filter(
-                        lambda x: x[0] == app_label, graph.node_map[last_node].parents
-                    )
-                )
-            )
-            if app_parents:
-                last_node = app_parents[-1]
-            else:  # if no parents mean we found initial migration
-                last_node = None
+            # no parents mean we found initial migration
+            last_node = max(parents_in_app[last_node], default=None)
         return ""
 
     def _get_view_identifiers_from_operation(self, operation) -> tuple[str, str]:
-        table_name = operation.code.table_name
-        if hasattr(operation.code, "view_engine") and operation.code.view_engine:
-            engine = operation.code.view_engine
-        else:
-            engine = settings.DATABASES["default"]["ENGINE"]
-        return table_name, engine
+        # Interned: table names and engines come from a small vocabulary and
+        # end up as dict keys in the graph-walk index, where pointer-equal
+        # strings make hashing and comparison a single check.
+        code = operation.code
+        return sys.intern(code.table_name), sys.intern(
+            getattr(code, "view_engine", None) or _default_view_engine()
+        )
 
     @staticmethod
     def get_cleaned_view_definition_value(view_definition: str) -> str:
@@ -360,16 +433,41 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
         ), "View definition must be callable and return string or be itself a string."
         return view_definition.strip()
 
-    def get_current_view_definition_from_database(self, table_name: str) -> str:
-        """working only with postgres"""
+    def get_current_view_definitions_from_database(
+        self, table_names: Iterable[str]
+    ) -> dict:
+        """
+        working only with postgres
+
+        Fetches all definitions in one round-trip. Missing relations and
+        relations that are not a (materialized) view map to "" without
+        affecting the rest of the batch; only a ProgrammingError on the
+        query itself (e.g. a malformed identifier) blanks every requested
+        definition, mirroring the old single-table fallback.
+        """
+        definitions = {table_name: "" for table_name in table_names}
+        if not definitions:
+            return definitions
         with connection.cursor() as cursor:
             try:
-                cursor.execute("SELECT pg_get_viewdef('%s')" % table_name)
-                current_view_definition = cursor.fetchone()[0].strip()
+                cursor.execute(
+                    "SELECT table_name, "
+                    "CASE WHEN c.relkind IN ('v', 'm') "
+                    "THEN pg_get_viewdef(c.oid) END "
+                    "FROM unnest(%s::text[]) AS table_name "
+                    "LEFT JOIN pg_class c ON c.oid = to_regclass(table_name)",
+                    [list(definitions)],
+                )
+                for table_name, view_definition in cursor.fetchall():
+                    if view_definition:
+                        definitions[table_name] = view_definition.strip()
             except ProgrammingError:  # VIEW NOT EXIST
-                current_view_definition = ""
-            finally:
-                return current_view_definition
+                pass
+        return definitions
+
+    def get_current_view_definition_from_database(self, table_name: str) -> str:
+        """working only with postgres"""
+        return self.get_current_view_definitions_from_database([table_name])[table_name]
 
     def _generate_added_field(self, app_label, model_name, field_name):
         # <START copy paste from MigrationAutodetector>
@@ -440,64 +538,83 @@ class ViewMigrationAutoDetector(MigrationAutodetector):
         Make AlterField operations, or possibly RemovedField/AddField if alter
         isn't possible.
         """
-        for app_label, model_name, field_name in sorted(
-            self.old_field_keys & self.new_field_keys
-        ):
-            # Did the field change?
-            old_model_name = self.renamed_models.get(
-                (app_label, model_name), model_name
-            )
-            old_field_name = self.renamed_fields.get(
-                (app_label, model_name, field_name), field_name
-            )
-            old_field = self.from_state.models[app_label, old_model_name].get_field(
-                old_field_name
+        # Both field maps are keyed by kept_unmanaged_keys, so there is no
+        # extra intersection to compute here; sorting stays per model for
+        # reproducible migration output.
+        for app_label, model_name in sorted(self.kept_unmanaged_keys):
+            shared_fields = (
+                self.old_field_map[app_label, model_name]
+                & self.new_field_map[app_label, model_name]
             )
-            new_field = self.to_state.models[app_label, model_name].get_field(
-                field_name
-            )
-            dependencies = []
-            old_field_dec = self.deep_deconstruct(old_field)
-            new_field_dec = self.deep_deconstruct(new_field)
-            # If the field was confirmed to be renamed it means that only
-            # db_column was allowed to change which generate_renamed_fields()
-            # already accounts for by adding an AlterField operation.
-            if old_field_dec != new_field_dec and old_field_name == field_name:
-                both_m2m = old_field.many_to_many and new_field.many_to_many
-                neither_m2m = not old_field.many_to_many and not new_field.many_to_many
-                if both_m2m or neither_m2m:
-                    # Either both fields are m2m or neither is
-                    preserve_default = True
-                    if (
-                        old_field.null
-                        and not new_field.null
-                        and not new_field.has_default()
-                        and new_field.db_default is models.NOT_PROVIDED
-                        and not new_field.many_to_many
-                    ):
-                        field = new_field.clone()
-                        new_default = self.questioner.ask_not_null_alteration(
-                            field_name, model_name
-                        )
-                        if new_default is not models.NOT_PROVIDED:
-                            field.default = new_default
-                            preserve_default = False
-                    else:
-                        field = new_field
-                    self.add_operation(
-                        app_label,
-                        AlterFieldComment(
-                            model_name=model_name,
-                            name=field_name,
-                            field=field,
-                            preserve_default=preserve_default,
-                        ),
-                        dependencies=dependencies,
+            for field_name in sorted(shared_fields):
+                self._generate_altered_field(app_label, model_name, field_name)
+
+    def _generate_altered_field(self, app_label, model_name, field_name):
+        # Did the field change?
+        old_model_name = self.renamed_models.get(
+            (app_label, model_name), model_name
+        )
+        old_field_name = self.renamed_fields.get(
+            (app_label, model_name, field_name), field_name
+        )
+        old_field = self.from_state.models[app_label, old_model_name].get_field(
+            old_field_name
+        )
+        new_field = self.to_state.models[app_label, model_name].get_field(
+            field_name
+        )
+        # Cloned states often share the very same field instance, or an equal
+        # clone; those cannot produce an operation, so skip the expensive
+        # deep_deconstruct for them.
+        if old_field is new_field:
+            return
+        if (
+            type(old_field) is type(new_field)
+            and old_field.__dict__ == new_field.__dict__
+        ):
+            return
+        dependencies = []
+        old_field_dec = self.deep_deconstruct(old_field)
+        new_field_dec = self.deep_deconstruct(new_field)
+        # If the field was confirmed to be renamed it means that only
+        # db_column was allowed to change which generate_renamed_fields()
+        # already accounts for by adding an AlterField operation.
+        if old_field_dec != new_field_dec and old_field_name == field_name:
+            both_m2m = old_field.many_to_many and new_field.many_to_many
+            neither_m2m = not old_field.many_to_many and not new_field.many_to_many
+            if both_m2m or neither_m2m:
+                # Either both fields are m2m or neither is
+                preserve_default = True
+                if (
+                    old_field.null
+                    and not new_field.null
+                    and not new_field.has_default()
+                    and new_field.db_default is models.NOT_PROVIDED
+                    and not new_field.many_to_many
+                ):
+                    field = new_field.clone()
+                    new_default = self.questioner.ask_not_null_alteration(
+                        field_name, model_name
                     )
+                    if new_default is not models.NOT_PROVIDED:
+                        field.default = new_default
+                        preserve_default = False
                 else:
-                    # We cannot alter between m2m and concrete fields
-                    self._generate_removed_field(app_label, model_name, field_name)
-                    self._generate_added_field(app_label, model_name, field_name)
+                    field = new_field
+                self.add_operation(
+                    app_label,
+                    AlterFieldComment(
+                        model_name=model_name,
+                        name=field_name,
+                        field=field,
+                        preserve_default=preserve_default,
+                    ),
+                    dependencies=dependencies,
+                )
+            else:
+                # We cannot alter between m2m and concrete fields
+                self._generate_removed_field(app_label, model_name, field_name)
+                self._generate_added_field(app_label, model_name, field_name)
 
     def detect_index_changes(self):
         pass
@@ -1,7 +1,6 @@
-from functools import partial
+import sys
 from typing import cast, Never
 
-from django.db.backends.base.schema import BaseDatabaseSchemaEditor
 from django.db.migrations import operations
 from django.db.migrations.state import ModelState
 from django.db import models
@@ -19,6 +18,11 @@ def get_table_engine_name_hash(table_name, engine):
 
 
 class DBViewModelState(ModelState):
+    # ModelState instances still carry a __dict__, but slot descriptors keep
+    # the per-view attributes out of it and make their access a fixed offset;
+    # one such state is built per ViewRunPython in the migration history.
+    __slots__ = ("view_engine", "view_definition", "base_class", "table_name")
+
     def __init__(
         self,
         *args,
@@ -32,10 +36,13 @@ class DBViewModelState(ModelState):
     ):
         super().__init__(*args, **kwargs)
         if VIEW_MIGRATION_CONTEXT["is_view_migration"]:
-            self.view_engine = view_engine
+            # Engines and table names form a small vocabulary that is
+            # compared over and over during autodetection; interned strings
+            # compare pointer-equal.
+            self.view_engine = sys.intern(view_engine) if view_engine else view_engine
             self.view_definition = view_definition
             self.base_class = base_class
-            self.table_name = table_name
+            self.table_name = sys.intern(table_name) if table_name else table_name
 
 
 class ViewRunPython(operations.RunPython):
@@ -83,46 +90,6 @@ class ViewDropRunPython(operations.RunPython):
             )
 
 
-def add_field_comment(schema_editor: BaseDatabaseSchemaEditor, model, field):
-    """
-    Create a field on a model. Usually involves adding a column, but may
-    involve adding a table instead (for M2M fields).
-    """
-    # Add field comment, if required.
-    if (
-        field.db_comment
-        and schema_editor.connection.features.supports_comments
-        and not schema_editor.connection.features.supports_comments_inline
-    ):
-        schema_editor.execute(
-            *schema_editor._alter_column_comment_sql(
-                model, field, None, field.db_comment
-            )
-        )
-    # Reset connection if required
-    if schema_editor.connection.features.connection_persists_old_columns:
-        schema_editor.connection.close()
-
-
-def remove_field_comment(schema_editor: BaseDatabaseSchemaEditor, model, field):
-    if field.db_parameters(connection=schema_editor.connection)["type"] is None:
-        return
-
-    if (
-        field.db_comment
-        and schema_editor.connection.features.supports_comments
-        and not schema_editor.connection.features.supports_comments_inline
-    ):
-        schema_editor.execute(
-            *schema_editor._alter_column_comment_sql(
-                model, field, None, None
-            )
-        )
-    # Reset connection if required
-    if schema_editor.connection.features.connection_persists_old_columns:
-        schema_editor.connection.close()
-
-
 class AddFieldComment(operations.AddField):
 
     def database_forwards(self, app_label, schema_editor, from_state, to_state):
@@ -133,8 +100,20 @@ class AddFieldComment(operations.AddField):
             type[models.Model], from_state.apps.get_model(app_label, self.model_name)
         )
         field = to_model._meta.get_field(self.name)
-        schema_editor.add_field = partial(add_field_comment, schema_editor)
-        schema_editor.add_field(from_model, field)
+        # Add field comment, if required.
+        if (
+            field.db_comment
+            and schema_editor.connection.features.supports_comments
+            and not schema_editor.connection.features.supports_comments_inline
+        ):
+            schema_editor.execute(
+                *schema_editor._alter_column_comment_sql(
+                    from_model, field, None, field.db_comment
+                )
+            )
+        # Reset connection if required
+        if schema_editor.connection.features.connection_persists_old_columns:
+            schema_editor.connection.close()
 
     def database_backwards(self, app_label, schema_editor, from_state, to_state) -> Never:
         pass
@@ -165,10 +144,22 @@ class AddFieldComment(operations.AddField):
 class RemoveFieldComment(operations.RemoveField):
     def database_forwards(self, app_label, schema_editor, from_state, to_state):
         from_model = from_state.apps.get_model(app_label, self.model_name)
-        schema_editor.remove_field = partial(remove_field_comment, schema_editor)
-        schema_editor.remove_field(
-            from_model, from_model._meta.get_field(self.name)
-        )
+        field = from_model._meta.get_field(self.name)
+        if field.db_parameters(connection=schema_editor.connection)["type"] is None:
+            return
+        if (
+            field.db_comment
+            and schema_editor.connection.features.supports_comments
+            and not schema_editor.connection.features.supports_comments_inline
+        ):
+            schema_editor.execute(
+                *schema_editor._alter_column_comment_sql(
+                    from_model, field, None, None
+                )
+            )
+        # Reset connection if required
+        if schema_editor.connection.features.connection_persists_old_columns:
+            schema_editor.connection.close()
 
     def database_backwards(self, app_label, schema_editor, from_state, to_state) -> Never:
         pass
@@ -181,30 +172,6 @@ class RemoveFieldComment(operations.RemoveField):
         return "remove_comment_%s_%s" % (self.model_name_lower, self.name_lower)
 
 
-def _alter_field_comment(
-    schema_editor: BaseDatabaseSchemaEditor,
-    model,
-    old_field,
-    new_field,
-    _old_type,
-    new_type,
-    _old_db_params,
-    _new_db_params,
-    _strict=False,
-):
-    # Comment change?
-    if schema_editor.connection.features.supports_comments and not new_field.many_to_many:
-        if old_field.db_comment != new_field.db_comment:
-            schema_editor.execute(
-                *schema_editor._alter_column_comment_sql(
-                    model, new_field, new_type, new_field.db_comment
-                )
-            )
-
-    if schema_editor.connection.features.connection_persists_old_columns:
-        schema_editor.connection.close()
-
-
 class AlterFieldComment(operations.AlterField):
     def database_forwards(self, app_label, schema_editor, from_state, to_state):
         to_model = cast(
@@ -215,8 +182,22 @@ class AlterFieldComment(operations.AlterField):
         )
         from_field = from_model._meta.get_field(self.name)
         to_field = to_model._meta.get_field(self.name)
-        schema_editor._alter_field = partial(_alter_field_comment, schema_editor)
-        schema_editor.alter_field(from_model, from_field, to_field)
+        # Comment change?
+        if (
+            schema_editor.connection.features.supports_comments
+            and not to_field.many_to_many
+            and from_field.db_comment != to_field.db_comment
+        ):
+            new_type = to_field.db_parameters(
+                connection=schema_editor.connection
+            )["type"]
+            schema_editor.execute(
+                *schema_editor._alter_column_comment_sql(
+                    from_model, to_field, new_type, to_field.db_comment
+                )
+            )
+        if schema_editor.connection.features.connection_persists_old_columns:
+            schema_editor.connection.close()
 
     def database_backwards(self, app_label, schema_editor, from_state, to_state) -> Never:
         pass
@@ -1,3 +1,7 @@
+import pytest
+from django.db import connection
+from django.db.migrations.state import ProjectState
+
 from django_db_views.autodetector import ViewMigrationAutoDetector
 
 
@@ -24,3 +28,29 @@ def test_is_same_views():
         """,
         "SELECT COUNT(*) FROM table WHERE is_countable GROUP BY kind",
     )
+
+
+@pytest.mark.django_db
+def test_get_current_view_definitions_from_database():
+    detector = ViewMigrationAutoDetector(ProjectState(), ProjectState())
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE VIEW batch_definitions_view AS SELECT 1 AS one")
+        cursor.execute("CREATE TABLE batch_definitions_table (id integer)")
+
+    definitions = detector.get_current_view_definitions_from_database(
+        ["batch_definitions_view", "batch_definitions_table", "not_existing_view"]
+    )
+    # One batched query; a table or a missing relation maps to an empty
+    # definition without affecting the other entries.
+    assert "SELECT 1" in definitions["batch_definitions_view"]
+    assert definitions["batch_definitions_table"] == ""
+    assert definitions["not_existing_view"] == ""
+
+    assert (
+        detector.get_current_view_definition_from_database("batch_definitions_view")
+        == definitions["batch_definitions_view"]
+    )
+    assert (
+        detector.get_current_view_definition_from_database("not_existing_view") == ""
+    )
+    assert detector.get_current_view_definitions_from_database([]) == {}